@@ -10,6 +10,7 @@ class Defaults:
     DEFAULT_LLM_TEMPERATURE = 0.0
 
     DEFAULT_GRAPH_STORE_TYPE = GraphStoreType.KUZU
+    DEFAULT_KUZU_ASYNC_POOL_SIZE = 4
 
     MODULE_INSTALL_COMMANDS = {
         "crewai": "pip install crewai",
@@ -21,6 +22,7 @@ class Defaults:
         "crewai_tools": "pip install 'crewai[tools]'",
         "replicate": "pip install replicate",
         "ray": "pip install 'ray[default]'",
+        "pyarrow": "pip install pyarrow",
     }
 
     DEFAULT_NUM_THREADS = 4
@@ -4,24 +4,48 @@ Code derived from: https://github.com/run-llama/llama_index/blob/802064aee72b03a
 Kùzu graph store index.
 """
 
+import asyncio
+import functools
 import json
 import os
-from typing import Any, Dict, Optional, Type, Collection
-
-from kuzu import Connection, PreparedStatement, QueryResult
-
+import weakref
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Optional,
+    Type,
+    Collection,
+    Sequence,
+    Iterator,
+    Callable,
+)
+
+from pydantic import PlainSerializer, WrapSerializer
+from pydantic_core import to_jsonable_python
+
+from motleycrew.common import Defaults
 from motleycrew.common import logger
+from motleycrew.common.exceptions import ModuleNotInstalled
 from motleycrew.storage import MotleyGraphNode
 from motleycrew.storage import MotleyGraphNodeType
 from motleycrew.storage import MotleyGraphStore
 
+if TYPE_CHECKING:
+    import pyarrow
+    from kuzu import Connection, PreparedStatement, QueryResult
+
+# Prefix marking string values that contain JSON-serialized data
+_JSON_CONTENT_PREFIX = "JSON__"
+
 
 class MotleyKuzuGraphStore(MotleyGraphStore):
     """Kuzu graph store implementation for motleycrew."""
 
     ID_ATTR = "_id"
 
-    JSON_CONTENT_PREFIX = "JSON__"
+    JSON_CONTENT_PREFIX = _JSON_CONTENT_PREFIX
 
     PYTHON_TO_CYPHER_TYPES_MAPPING = {
         int: "INT64",  # TODO: enforce size when creating and updating nodes and relations
@@ -34,14 +58,46 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Optional[bool]: "BOOLEAN",
     }
 
-    def __init__(self, database: Any) -> None:
+    # Node labels by node class, shared between all stores as labels are class attributes
+    _label_cache: dict[Type[MotleyGraphNode], str] = {}
+
+    def __init__(
+        self, database: Any, async_pool_size: int = Defaults.DEFAULT_KUZU_ASYNC_POOL_SIZE
+    ) -> None:
         """Initialize Kuzu graph store.
 
         Args:
             database: Kuzu database client
+            async_pool_size: Maximum number of concurrent queries issued by the async methods
         """
+        import kuzu
+
         self.database = database
-        self.connection = Connection(database)
+        self.connection = kuzu.Connection(database)
+
+        # Extra connections for the async methods, so that read queries can run concurrently.
+        # Kuzu allows only one write transaction at a time, so async writes are serialized.
+        self._async_connections: list[Connection] = []
+        self._async_pool_size = async_pool_size
+        # asyncio primitives are bound to an event loop, so they are created per running loop
+        self._async_primitives: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[asyncio.Semaphore, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+
+        # Nodes inserted inside the current bulk transaction, so that their ids can be reset
+        # if it is rolled back; None outside of a transaction
+        self._transaction_nodes: Optional[list[MotleyGraphNode]] = None
+
+        # Schema cache, populated lazily and kept up to date by DDL issued through this class
+        self._node_tables: Optional[set[str]] = None
+        self._rel_tables: Optional[list[dict[str, str]]] = None
+
+        # Prepared statements for frequent queries, keyed by (operation, *labels[, node class])
+        self._prepared: dict[tuple[Any, ...], PreparedStatement] = {}
+
+        # Per node class metadata: names of JSON-serialized fields, the Cypher insert mapping
+        # and the names of the class's table columns as of the last ensure_node_table call
+        self._node_class_meta: dict[Type[MotleyGraphNode], dict[str, Any]] = {}
 
     def __repr__(self):
         return f"{self.__class__.__name__}(path={self.database_path})"
@@ -54,8 +110,8 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         return os.path.abspath(self.database.database_path)
 
     def _execute_query(
-        self, query: str | PreparedStatement, parameters: Optional[dict[str, Any]] = None
-    ) -> QueryResult:
+        self, query: "str | PreparedStatement", parameters: Optional[dict[str, Any]] = None
+    ) -> "QueryResult":
         """Execute a query, logging it for debugging purposes.
 
         Args:
@@ -72,6 +128,192 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         # TODO: retries?
         return self.connection.execute(query=query, parameters=parameters)
 
+    def _execute_prepared_query(
+        self,
+        key: tuple[Any, ...],
+        query_fn: Callable[[], str],
+        parameters: Optional[dict[str, Any]] = None,
+    ) -> "QueryResult":
+        """Execute a query using a cached prepared statement, preparing it on first use.
+
+        Args:
+            key: Cache key of the form (operation, *labels), e.g. ``("node_exists", "Question")``.
+                Queries depending on the node class rather than just its label
+                also include the class itself.
+            query_fn: Function building the Cypher query, only called on a cache miss.
+            parameters: Query parameters.
+
+        Returns:
+            Query result.
+        """
+        prepared_statement = self._prepared.get(key)
+        if prepared_statement is None:
+            query = query_fn()
+            logger.debug("Preparing query %s: %s", key, query)
+            prepared_statement = self.connection.prepare(query)
+            if not prepared_statement.is_success():
+                raise RuntimeError(
+                    f"Failed to prepare query {query}: {prepared_statement.get_error_message()}"
+                )
+            self._prepared[key] = prepared_statement
+
+        return self._execute_query(prepared_statement, parameters)
+
+    def _invalidate_prepared_statements(self, label: str) -> None:
+        """Drop cached prepared statements involving the given node label.
+
+        Args:
+            label: Node label.
+        """
+        for key in [key for key in self._prepared if label in key[1:]]:
+            del self._prepared[key]
+
+    async def _aexecute_query(
+        self, query: str, parameters: Optional[dict[str, Any]] = None
+    ) -> "QueryResult":
+        """Execute a query in a worker thread, using a connection from the async pool.
+
+        Write queries must be issued while holding the lock from :meth:`_get_async_write_lock`.
+
+        Args:
+            query: Cypher query.
+            parameters: Query parameters.
+
+        Returns:
+            Query result.
+        """
+        async with self._get_async_primitives()[0]:
+            if self._async_connections:
+                connection = self._async_connections.pop()
+            else:
+                import kuzu
+
+                connection = kuzu.Connection(self.database)
+
+            logger.debug("Executing async query: %s", query)
+            if parameters:
+                logger.debug("with parameters: %s", parameters)
+
+            try:
+                return await asyncio.to_thread(connection.execute, query, parameters)
+            finally:
+                self._async_connections.append(connection)
+
+    def _get_async_primitives(self) -> tuple[asyncio.Semaphore, asyncio.Lock]:
+        """Get the async connection pool semaphore and the write lock for the running event loop.
+
+        Returns:
+            Tuple of the semaphore and the write lock.
+        """
+        loop = asyncio.get_running_loop()
+        primitives = self._async_primitives.get(loop)
+        if primitives is None:
+            primitives = (asyncio.Semaphore(self._async_pool_size), asyncio.Lock())
+            self._async_primitives[loop] = primitives
+        return primitives
+
+    def _get_async_write_lock(self) -> asyncio.Lock:
+        """Get the lock serializing async writes in the running event loop.
+
+        Async writes run on the pooled connections, so they cannot be part of a bulk transaction
+        open on the main connection, and would conflict with its write transaction.
+
+        Returns:
+            Write lock.
+        """
+        if self._transaction_nodes is not None:
+            raise RuntimeError("Async writes are not supported inside bulk_transaction()")
+        return self._get_async_primitives()[1]
+
+    def close(self) -> None:
+        """Close the database connections of this graph store, including the async pool."""
+        while self._async_connections:
+            self._async_connections.pop().close()
+        self.connection.close()
+
+    @contextmanager
+    def bulk_transaction(self) -> Iterator[None]:
+        """Run all queries issued inside the context in a single transaction.
+
+        By default, Kuzu commits every query in its own transaction, which is slow
+        for bulk mutations such as calling :meth:`upsert_triplet` in a loop.
+        The transaction is committed on exit, or rolled back if an exception is raised.
+
+        On rollback, the ids of nodes inserted inside the transaction are reset to None.
+        Kuzu also rolls back the transaction by itself if a query inside it fails.
+
+        If the database was opened with ``auto_checkpoint=False``, a checkpoint
+        is also performed after the commit.
+
+        Example:
+            .. code-block:: python
+
+                with graph_store.bulk_transaction():
+                    for from_node, to_node, label in triplets:
+                        graph_store.upsert_triplet(from_node, to_node, label)
+        """
+        self._execute_query("BEGIN TRANSACTION")
+        self._transaction_nodes = []
+        try:
+            yield
+        except BaseException:
+            logger.info("Rolling back bulk transaction")
+            try:
+                self._execute_query("ROLLBACK")
+            except RuntimeError as e:
+                # A failed query makes Kuzu roll back the transaction itself
+                logger.warning("Bulk transaction was already rolled back: %s", e)
+            self._rollback_transaction_nodes()
+            raise
+
+        try:
+            self._execute_query("COMMIT")
+        except BaseException:
+            self._rollback_transaction_nodes()
+            raise
+
+        self._transaction_nodes = None
+        if not getattr(self.database, "auto_checkpoint", True):
+            self._execute_query("CHECKPOINT")
+
+    def _rollback_transaction_nodes(self) -> None:
+        """Reset the state cached by this graph store after a bulk transaction is rolled back."""
+        for node in self._transaction_nodes or []:
+            MotleyKuzuGraphStore._set_node_id(node, None)
+        self._transaction_nodes = None
+        self.invalidate_schema_cache()  # DDL issued in the transaction is rolled back too
+
+    def invalidate_schema_cache(self) -> None:
+        """Drop the cached node and relation table names.
+
+        Call this if the database schema was changed bypassing this graph store.
+        """
+        self._node_tables = None
+        self._rel_tables = None
+        self._prepared.clear()
+        for meta in self._node_class_meta.values():
+            meta.pop("db_fields", None)
+
+    def _get_node_tables(self) -> set[str]:
+        """Get the names of node tables in the database, using the schema cache.
+
+        Returns:
+            Set of node table names.
+        """
+        if self._node_tables is None:
+            self._node_tables = set(self.connection._get_node_table_names())
+        return self._node_tables
+
+    def _get_rel_tables(self) -> list[dict[str, str]]:
+        """Get the relation tables in the database, using the schema cache.
+
+        Returns:
+            List of dicts with relation table name, source and destination node table names.
+        """
+        if self._rel_tables is None:
+            self._rel_tables = list(self.connection._get_rel_table_names())
+        return self._rel_tables
+
     def _check_node_table_exists(self, label: str) -> bool:
         """Check if a table for storing nodes with given label exists in the database.
 
@@ -81,7 +323,7 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Whether the table exists.
         """
-        return label in self.connection._get_node_table_names()
+        return label in self._get_node_tables()
 
     def _check_rel_table_exists(
         self,
@@ -100,7 +342,7 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Whether the table exists.
         """
-        for row in self.connection._get_rel_table_names():
+        for row in self._get_rel_tables():
             if (
                 (rel_label is None or row["name"] == rel_label)
                 and (from_label is None or row["src"] == from_label)
@@ -120,6 +362,66 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         """
         return self.connection._get_node_property_names(table_name=label)
 
+    @classmethod
+    def _get_label(cls, node_class: Type[MotleyGraphNode]) -> str:
+        """Get the label of a node class, caching it on first use.
+
+        Args:
+            node_class: Node Python class.
+
+        Returns:
+            Node label.
+        """
+        label = cls._label_cache.get(node_class)
+        if label is None:
+            label = cls._label_cache.setdefault(node_class, node_class.get_label())
+        return label
+
+    def _get_node_class_meta(self, node_class: Type[MotleyGraphNode]) -> dict[str, Any]:
+        """Get the cached metadata for a node class, computing it on first use.
+
+        The metadata contains the names of fields stored as JSON strings (``json_fields``),
+        the Cypher mapping used for inserting nodes of the class (``insert_template``)
+        and whether the class customizes its serialization (``custom_serializers``).
+        After :meth:`ensure_node_table` is called for the class, it also contains
+        the names of the columns in the node table (``db_fields``).
+
+        Args:
+            node_class: Node Python class.
+
+        Returns:
+            Node class metadata.
+        """
+        meta = self._node_class_meta.get(node_class)
+        if meta is None:
+            assert "id" not in node_class.model_fields, "id field is reserved for node id"
+
+            json_fields = frozenset(
+                field_name
+                for field_name, field in node_class.model_fields.items()
+                if MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(
+                    field.annotation
+                )[1]
+            )
+            insert_template = (
+                "{" + ", ".join(f"{name}: ${name}" for name in node_class.model_fields) + "}"
+            )
+            decorators = node_class.__pydantic_decorators__
+            custom_serializers = bool(
+                decorators.field_serializers or decorators.model_serializers
+            ) or any(
+                isinstance(metadata, (PlainSerializer, WrapSerializer))
+                for field in node_class.model_fields.values()
+                for metadata in field.metadata
+            )
+            meta = {
+                "json_fields": json_fields,
+                "insert_template": insert_template,
+                "custom_serializers": custom_serializers,
+            }
+            self._node_class_meta[node_class] = meta
+        return meta
+
     def ensure_node_table(self, node_class: Type[MotleyGraphNode]) -> str:
         """Create a table for storing nodes of that class if such does not already exist.
         If it does exist, create all missing columns.
@@ -130,21 +432,24 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Node table name.
         """
-        table_name = node_class.get_label()
+        table_name = self._get_label(node_class)
+        meta = self._get_node_class_meta(node_class)
+        if "db_fields" in meta and self._check_node_table_exists(table_name):
+            return table_name  # the table and its columns were already ensured for this class
+
         if not self._check_node_table_exists(table_name):
             logger.info("Node table %s does not exist in the database, creating", table_name)
-            self._execute_query(
-                "CREATE NODE TABLE {} (id SERIAL, PRIMARY KEY(id))".format(table_name)
-            )
+            self._execute_query(f"CREATE NODE TABLE {table_name} (id SERIAL, PRIMARY KEY(id))")
+            self._get_node_tables().add(table_name)
 
         # Create missing property columns
-        existing_property_names = self._get_node_property_names(node_class.get_label())
+        existing_property_names = self._get_node_property_names(table_name)
         for field_name, field in node_class.model_fields.items():
             if field_name not in existing_property_names:
                 logger.info(
                     "Property %s not present in table for label %s, creating",
                     field_name,
-                    node_class.get_label(),
+                    table_name,
                 )
                 cypher_type, is_json = (
                     MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(
@@ -152,9 +457,10 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
                     )
                 )
 
-                self._execute_query(
-                    "ALTER TABLE {} ADD {} {}".format(table_name, field_name, cypher_type)
-                )
+                self._execute_query(f"ALTER TABLE {table_name} ADD {field_name} {cypher_type}")
+                self._invalidate_prepared_statements(table_name)
+
+        meta["db_fields"] = frozenset(existing_property_names).union(node_class.model_fields)
         return table_name
 
     def ensure_relation_table(
@@ -168,21 +474,22 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
             to_class: Destination node Python class.
             label: Relation label.
         """
+        from_label = self._get_label(from_class)
+        to_label = self._get_label(to_class)
         if not self._check_rel_table_exists(
-            from_label=from_class.get_label(), to_label=to_class.get_label(), rel_label=label
+            from_label=from_label, to_label=to_label, rel_label=label
         ):
             logger.info(
                 "Relation table %s from %s to %s does not exist in the database, creating",
                 label,
-                from_class.get_label(),
-                to_class.get_label(),
+                from_label,
+                to_label,
             )
 
-            self._execute_query(
-                "CREATE REL TABLE {} (FROM {} TO {})".format(
-                    label, from_class.get_label(), to_class.get_label()
-                )
-            )
+            self._execute_query(f"CREATE REL TABLE {label} (FROM {from_label} TO {to_label})")
+            self._get_rel_tables().append({"name": label, "src": from_label, "dst": to_label})
+            self._invalidate_prepared_statements(from_label)
+            self._invalidate_prepared_statements(to_label)
 
     def check_node_exists_by_class_and_id(
         self, node_class: Type[MotleyGraphNode], node_id: int
@@ -196,11 +503,13 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Whether the node exists in the database.
         """
-        if not self._check_node_table_exists(node_class.get_label()):
+        label = self._get_label(node_class)
+        if not self._check_node_table_exists(label):
             return False
 
-        is_exists_result = self._execute_query(
-            "MATCH (n:{}) WHERE n.id = $node_id RETURN n.id".format(node_class.get_label()),
+        is_exists_result = self._execute_prepared_query(
+            ("node_exists", label),
+            lambda: f"MATCH (n:{label}) WHERE n.id = $node_id RETURN 1 LIMIT 1",
             {"node_id": node_id},
         )
         return is_exists_result.has_next()
@@ -235,30 +544,32 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         if from_node.id is None or to_node.id is None:
             return False
 
+        from_label = self._get_label(type(from_node))
+        to_label = self._get_label(type(to_node))
         if (
-            not self._check_node_table_exists(from_node.get_label())
-            or not self._check_node_table_exists(to_node.get_label())
+            not self._check_node_table_exists(from_label)
+            or not self._check_node_table_exists(to_label)
             or not self._check_rel_table_exists(
-                from_label=from_node.get_label(), to_label=to_node.get_label(), rel_label=label
+                from_label=from_label, to_label=to_label, rel_label=label
             )
         ):
             return False
 
-        query = (
-            "MATCH (n1:{})-[r{}]->(n2:{}) "
-            "WHERE n1.id = $from_node_id AND n2.id = $to_node_id "
-            "RETURN r".format(
-                from_node.get_label(),
-                (":" + label) if label else "",
-                to_node.get_label(),
-            )
-        )
+        rel_pattern = f"r:{label}" if label else "r"
         parameters = {
             "from_node_id": from_node.id,
             "to_node_id": to_node.id,
         }
 
-        is_exists_result = self._execute_query(query=query, parameters=parameters)
+        is_exists_result = self._execute_prepared_query(
+            ("relation_exists", from_label, to_label, label),
+            lambda: (
+                f"MATCH (n1:{from_label})-[{rel_pattern}]->(n2:{to_label}) "
+                "WHERE n1.id = $from_node_id AND n2.id = $to_node_id "
+                "RETURN 1 LIMIT 1"
+            ),
+            parameters,
+        )
         return is_exists_result.has_next()
 
     def get_node_by_class_and_id(
@@ -273,17 +584,15 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Node object or None if it does not exist.
         """
-        if not self._check_node_table_exists(node_class.get_label()):
+        label = self._get_label(node_class)
+        if not self._check_node_table_exists(label):
             return None
 
-        query = """
-                    MATCH (n:{})
-                    WHERE n.id = $node_id
-                    RETURN n;
-                """.format(
-            node_class.get_label()
+        query_result = self._execute_prepared_query(
+            ("get_node", label),
+            lambda: f"MATCH (n:{label}) WHERE n.id = $node_id RETURN n",
+            {"node_id": node_id},
         )
-        query_result = self._execute_query(query, {"node_id": node_id})
 
         if query_result.has_next():
             row = query_result.get_next()
@@ -302,29 +611,107 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         """
         assert node.id is None, "Entity has its id set, looks like it is already in the DB"
 
-        self.ensure_node_table(type(node))
-        logger.info("Inserting new node with label %s: %s", node.get_label(), node)
+        label = self.ensure_node_table(type(node))
+        logger.info("Inserting new node with label %s: %s", label, node)
 
-        cypher_mapping, parameters = MotleyKuzuGraphStore._node_to_cypher_mapping_with_parameters(
-            node
-        )
-        create_result = self._execute_query(
-            "CREATE (n:{} {}) RETURN n".format(node.get_label(), cypher_mapping),
+        cypher_mapping, parameters = self._node_to_cypher_mapping_with_parameters(node)
+        create_result = self._execute_prepared_query(
+            ("insert_node", label, type(node)),
+            lambda: f"CREATE (n:{label} {cypher_mapping}) RETURN n.id",
             parameters=parameters,
         )
         assert create_result.has_next()
         logger.info("Node created OK")
 
-        created_object = create_result.get_next()[0]
-        created_object_id = created_object.get("id")
-        assert created_object_id is not None, "BUG: created object ID was not returned: {}".format(
-            created_object
-        )
+        created_object_id = create_result.get_next()[0]
+        assert created_object_id is not None, "BUG: created object ID was not returned"
 
         MotleyKuzuGraphStore._set_node_id(node=node, node_id=created_object_id)
         node.__graph_store__ = self
+        if self._transaction_nodes is not None:
+            self._transaction_nodes.append(node)
         return node
 
+    def insert_nodes(self, nodes: Sequence[MotleyGraphNodeType]) -> list[MotleyGraphNodeType]:
+        """Insert multiple new nodes and populate their ids.
+
+        Nodes are grouped by class, and each group is inserted with a single query,
+        which is much faster than calling :meth:`insert_node` for every node.
+        A node object appearing several times in ``nodes`` is inserted once.
+        If the node tables or some columns do not exist, this method also creates them.
+
+        Args:
+            nodes: Nodes to insert.
+
+        Returns:
+            Inserted nodes.
+        """
+        nodes_by_class: dict[Type[MotleyGraphNode], list[MotleyGraphNode]] = {}
+        for node in {id(node): node for node in nodes}.values():
+            assert node.id is None, "Entity has its id set, looks like it is already in the DB"
+            nodes_by_class.setdefault(type(node), []).append(node)
+
+        for node_class, class_nodes in nodes_by_class.items():
+            self._insert_nodes_of_class(node_class=node_class, nodes=class_nodes)
+
+        return list(nodes)
+
+    def _insert_nodes_of_class(
+        self, node_class: Type[MotleyGraphNode], nodes: list[MotleyGraphNode]
+    ) -> None:
+        """Insert multiple new nodes of the same class with a single query.
+
+        Args:
+            node_class: Node Python class.
+            nodes: Nodes to insert.
+        """
+        label = self.ensure_node_table(node_class)
+        logger.info("Inserting %d new nodes with label %s", len(nodes), label)
+
+        node_parameters = [self._node_to_cypher_parameters(node) for node in nodes]
+        # Kuzu cannot infer the type of a column that is null in every row, so such columns
+        # are omitted from the query (they are left null in the DB anyway).
+        field_names = [
+            field_name
+            for field_name in node_class.model_fields
+            if any(parameters.get(field_name) is not None for parameters in node_parameters)
+        ]
+
+        if field_names:
+            cypher_mapping = (
+                "{" + ", ".join(f"{name}: row.props.{name}" for name in field_names) + "}"
+            )
+            rows = [
+                {"idx": idx, "props": {name: parameters[name] for name in field_names}}
+                for idx, parameters in enumerate(node_parameters)
+            ]
+            create_result = self._execute_query(
+                f"UNWIND $rows AS row CREATE (n:{label} {cypher_mapping}) RETURN row.idx, n.id",
+                {"rows": rows},
+            )
+        else:
+            create_result = self._execute_query(
+                f"UNWIND range(0, $num_nodes - 1) AS idx CREATE (n:{label}) RETURN idx, n.id",
+                {"num_nodes": len(nodes)},
+            )
+
+        num_created = 0
+        while create_result.has_next():
+            idx, created_object_id = create_result.get_next()
+            assert created_object_id is not None, "BUG: created object ID was not returned"
+
+            node = nodes[idx]
+            MotleyKuzuGraphStore._set_node_id(node=node, node_id=created_object_id)
+            node.__graph_store__ = self
+            if self._transaction_nodes is not None:
+                self._transaction_nodes.append(node)
+            num_created += 1
+
+        assert num_created == len(nodes), "BUG: expected {} nodes to be created, got {}".format(
+            len(nodes), num_created
+        )
+        logger.info("Nodes created OK")
+
     def create_relation(
         self, from_node: MotleyGraphNode, to_node: MotleyGraphNode, label: str
     ) -> None:
@@ -348,21 +735,24 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
 
         self.ensure_relation_table(from_class=type(from_node), to_class=type(to_node), label=label)
 
+        from_label = self._get_label(type(from_node))
+        to_label = self._get_label(type(to_node))
         logger.info(
             "Creating relation %s from %s:%s to %s:%s",
             label,
-            from_node.get_label(),
+            from_label,
             from_node.id,
-            to_node.get_label(),
+            to_label,
             to_node.id,
         )
 
         create_result = self._execute_query(
             (
-                "MATCH (n1:{}), (n2:{}) WHERE n1.id = $from_id AND n2.id = $to_id "
-                "CREATE (n1)-[r:{}]->(n2) "
+                f"MATCH (n1:{from_label}), (n2:{to_label}) "
+                "WHERE n1.id = $from_id AND n2.id = $to_id "
+                f"CREATE (n1)-[r:{label}]->(n2) "
                 "RETURN r"
-            ).format(from_node.get_label(), to_node.get_label(), label),
+            ),
             {
                 "from_id": from_node.id,
                 "to_id": to_node.id,
@@ -371,6 +761,72 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         assert create_result.has_next()
         logger.info("Relation created OK")
 
+    def create_relations(
+        self, triplets: Sequence[tuple[MotleyGraphNode, MotleyGraphNode, str]]
+    ) -> None:
+        """Create multiple relations between existing nodes.
+
+        Relations are grouped by the labels of the nodes and the relation,
+        and each group is created with a single query.
+        All the nodes are checked to be present in the database before creating any relations.
+        If the relation tables do not exist, this method also creates them.
+
+        Args:
+            triplets: Tuples of source node, destination node and relation label.
+        """
+        pairs_by_labels: dict[
+            tuple[Type[MotleyGraphNode], Type[MotleyGraphNode], str], list[dict[str, int]]
+        ] = {}
+        node_ids_by_class: dict[Type[MotleyGraphNode], set[int]] = {}
+        for from_node, to_node, label in triplets:
+            assert from_node.id is not None and to_node.id is not None, (
+                "Nodes must be present in the database, "
+                "consider using upsert_triplet() for such cases"
+            )
+            pairs_by_labels.setdefault((type(from_node), type(to_node), label), []).append(
+                {"from_id": from_node.id, "to_id": to_node.id}
+            )
+            node_ids_by_class.setdefault(type(from_node), set()).add(from_node.id)
+            node_ids_by_class.setdefault(type(to_node), set()).add(to_node.id)
+
+        for node_class, node_ids in node_ids_by_class.items():
+            node_label = self._get_label(node_class)
+            num_found = 0
+            if self._check_node_table_exists(node_label):
+                num_found = self._execute_query(
+                    f"MATCH (n:{node_label}) WHERE n.id IN $ids RETURN count(n)",
+                    {"ids": list(node_ids)},
+                ).get_next()[0]
+            assert num_found == len(node_ids), (
+                "Some of the nodes are not present in the database, "
+                "consider using upsert_triplet() for such cases"
+            )
+
+        for (from_class, to_class, label), pairs in pairs_by_labels.items():
+            self.ensure_relation_table(from_class=from_class, to_class=to_class, label=label)
+
+            from_label = self._get_label(from_class)
+            to_label = self._get_label(to_class)
+            logger.info(
+                "Creating %d relations %s from %s to %s", len(pairs), label, from_label, to_label
+            )
+            create_result = self._execute_query(
+                (
+                    "UNWIND $pairs AS pair "
+                    f"MATCH (n1:{from_label}), (n2:{to_label}) "
+                    "WHERE n1.id = pair.from_id AND n2.id = pair.to_id "
+                    f"CREATE (n1)-[r:{label}]->(n2) "
+                    "RETURN count(r)"
+                ),
+                {"pairs": pairs},
+            )
+            num_created = create_result.get_next()[0]
+            assert num_created == len(pairs), (
+                "Some of the nodes are not present in the database, "
+                "consider using upsert_triplet() for such cases"
+            )
+            logger.info("Relations created OK")
+
     def upsert_triplet(
         self, from_node: MotleyGraphNode, to_node: MotleyGraphNode, label: str
     ) -> None:
@@ -384,52 +840,167 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
             to_node: Destination node.
             label: Relation label.
         """
-        if not self.check_node_exists(from_node):
+        # A node without an id cannot be in the database, and a node with an id is assumed
+        # to be there (this is verified below when merging the relation)
+        if from_node.id is None:
             logger.info("Node %s does not exist, creating", from_node)
             self.insert_node(from_node)
 
-        if not self.check_node_exists(to_node):
+        if to_node.id is None:
             logger.info("Node %s does not exist, creating", to_node)
             self.insert_node(to_node)
 
-        if not self.check_relation_exists(from_node=from_node, to_node=to_node, label=label):
-            logger.info("Relation from %s to %s does not exist, creating", from_node, to_node)
-            self.create_relation(from_node=from_node, to_node=to_node, label=label)
+        self.ensure_relation_table(from_class=type(from_node), to_class=type(to_node), label=label)
 
-    def delete_node(self, node: MotleyGraphNode) -> None:
-        """Delete a given node and its relations.
+        from_label = self._get_label(type(from_node))
+        to_label = self._get_label(type(to_node))
+        logger.info(
+            "Merging relation %s from %s:%s to %s:%s",
+            label,
+            from_label,
+            from_node.id,
+            to_label,
+            to_node.id,
+        )
+        merge_result = self._execute_prepared_query(
+            ("merge_relation", from_label, to_label, label),
+            lambda: (
+                f"MATCH (n1:{from_label}), (n2:{to_label}) "
+                "WHERE n1.id = $from_id AND n2.id = $to_id "
+                f"MERGE (n1)-[r:{label}]->(n2) "
+                "RETURN count(r)"
+            ),
+            {"from_id": from_node.id, "to_id": to_node.id},
+        )
+        assert (
+            merge_result.get_next()[0] > 0
+        ), "Node has its id set, but is not present in the database: {} or {}".format(
+            from_node, to_node
+        )
+
+    async def acheck_node_exists_by_class_and_id(
+        self, node_class: Type[MotleyGraphNode], node_id: int
+    ) -> bool:
+        """Async version of :meth:`check_node_exists_by_class_and_id`.
 
         Args:
-            node: Node to delete.
+            node_class: Node Python class.
+            node_id: Node id.
+
+        Returns:
+            Whether the node exists in the database.
+        """
+        label = self._get_label(node_class)
+        if not self._check_node_table_exists(label):
+            return False
+
+        is_exists_result = await self._aexecute_query(
+            f"MATCH (n:{label}) WHERE n.id = $node_id RETURN 1 LIMIT 1", {"node_id": node_id}
+        )
+        return is_exists_result.has_next()
+
+    async def acheck_node_exists(self, node: MotleyGraphNode) -> bool:
+        """Async version of :meth:`check_node_exists`.
+
+        Args:
+            node: Node to check.
+
+        Returns:
+            Whether the node exists in the database.
         """
+        if node.id is None:
+            return False
 
-        def inner_delete_relations(node_label: str, node_id: int) -> None:
-            if not self.connection._get_rel_table_names():
-                # Avoid Kuzu error when no relation tables exist in the database
-                return
+        return await self.acheck_node_exists_by_class_and_id(
+            node_class=node.__class__, node_id=node.id
+        )
 
-            # Undirected relation removal is not supported for some reason
-            if self._check_rel_table_exists(from_label=node_label):
-                self._execute_query(
-                    "MATCH (n:{})-[r]->() WHERE n.id = $node_id DELETE r".format(node_label),
-                    {"node_id": node_id},
+    async def ainsert_node(self, node: MotleyGraphNodeType) -> MotleyGraphNodeType:
+        """Async version of :meth:`insert_node`.
+
+        Args:
+            node: Node to insert.
+
+        Returns:
+            Inserted node.
+        """
+        async with self._get_async_write_lock():
+            assert node.id is None, "Entity has its id set, looks like it is already in the DB"
+
+            label = await asyncio.to_thread(self.ensure_node_table, type(node))
+            logger.info("Inserting new node with label %s: %s", label, node)
+
+            cypher_mapping, parameters = self._node_to_cypher_mapping_with_parameters(node)
+            create_result = await self._aexecute_query(
+                f"CREATE (n:{label} {cypher_mapping}) RETURN n.id", parameters
+            )
+            assert create_result.has_next()
+            created_object_id = create_result.get_next()[0]
+            logger.info("Node created OK")
+
+        MotleyKuzuGraphStore._set_node_id(node=node, node_id=created_object_id)
+        node.__graph_store__ = self
+        return node
+
+    async def aupsert_triplets(
+        self, triplets: Sequence[tuple[MotleyGraphNode, MotleyGraphNode, str]]
+    ) -> None:
+        """Async version of :meth:`upsert_triplet` for multiple triplets.
+
+        Existence checks for the nodes that have ids are run concurrently.
+        Then the missing nodes are inserted and the relations are merged;
+        these writes are serialized, as Kuzu allows only one write transaction at a time.
+
+        Args:
+            triplets: Tuples of source node, destination node and relation label.
+        """
+        nodes = list({id(node): node for triplet in triplets for node in triplet[:2]}.values())
+
+        existing_nodes = [node for node in nodes if node.id is not None]
+        nodes_exist = await asyncio.gather(
+            *(self.acheck_node_exists(node) for node in existing_nodes)
+        )
+        for node, node_exists in zip(existing_nodes, nodes_exist):
+            assert (
+                node_exists
+            ), "Node has its id set, but is not present in the database: {}".format(node)
+
+        await asyncio.gather(*(self.ainsert_node(node) for node in nodes if node.id is None))
+
+        async with self._get_async_write_lock():
+            for from_node, to_node, label in triplets:
+                await asyncio.to_thread(
+                    self.ensure_relation_table,
+                    from_class=type(from_node),
+                    to_class=type(to_node),
+                    label=label,
                 )
-            if self._check_rel_table_exists(to_label=node_label):
-                self._execute_query(
-                    "MATCH (n:{})<-[r]-() WHERE n.id = $node_id DELETE r".format(node_label),
-                    {"node_id": node_id},
+
+                from_label = self._get_label(type(from_node))
+                to_label = self._get_label(type(to_node))
+                await self._aexecute_query(
+                    (
+                        f"MATCH (n1:{from_label}), (n2:{to_label}) "
+                        "WHERE n1.id = $from_id AND n2.id = $to_id "
+                        f"MERGE (n1)-[r:{label}]->(n2)"
+                    ),
+                    {"from_id": from_node.id, "to_id": to_node.id},
                 )
 
-        def inner_delete_node(node_label: str, node_id: int) -> None:
-            self._execute_query(
-                "MATCH (n:{}) WHERE n.id = $node_id DELETE n".format(node_label),
-                {"node_id": node_id},
-            )
+    def delete_node(self, node: MotleyGraphNode) -> None:
+        """Delete a given node and its relations.
 
+        Args:
+            node: Node to delete.
+        """
         assert self.check_node_exists(node), "Cannot delete nonexistent node: {}".format(node)
 
-        inner_delete_relations(node_label=node.get_label(), node_id=node.id)
-        inner_delete_node(node_label=node.get_label(), node_id=node.id)
+        label = self._get_label(type(node))
+        self._execute_prepared_query(
+            ("delete_node", label),
+            lambda: f"MATCH (n:{label}) WHERE n.id = $node_id DETACH DELETE n",
+            {"node_id": node.id},
+        )
 
         MotleyKuzuGraphStore._set_node_id(node, None)
 
@@ -443,9 +1014,13 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Updated node.
         """
-        property_value = getattr(node, property_name)
+        property_value = self._get_node_field_values(node, include={property_name})[property_name]
 
-        existing_property_names = self._get_node_property_names(node.get_label())
+        label = self._get_label(type(node))
+        meta = self._get_node_class_meta(node.__class__)
+        existing_property_names = meta.get("db_fields", frozenset())
+        if property_name not in existing_property_names:
+            existing_property_names = self._get_node_property_names(label)
 
         assert (
             property_name in node.__class__.model_fields
@@ -453,28 +1028,22 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
 
         assert self.check_node_exists(node)
         assert property_name in existing_property_names, "No such field in DB table {}: {}".format(
-            node.get_label(), property_name
+            label, property_name
         )
 
-        _, is_json = MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(
-            node.__class__.model_fields[property_name].annotation
-        )
+        is_json = property_name in meta["json_fields"]
 
         db_property_name = property_name
         if is_json:
-            db_property_value = MotleyKuzuGraphStore.JSON_CONTENT_PREFIX + json.dumps(
-                property_value
-            )
+            db_property_value = MotleyKuzuGraphStore._serialize_json_value(property_value)
         else:
             db_property_value = property_value
 
-        query = """
-                    MATCH (n:{})
+        query = f"""
+                    MATCH (n:{label})
                     WHERE n.id = $node_id
-                    SET n.{} = $property_value RETURN n;
-                """.format(
-            node.get_label(), db_property_name
-        )
+                    SET n.{db_property_name} = $property_value RETURN n;
+                """
 
         query_result = self._execute_query(
             query,
@@ -505,16 +1074,80 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             List of query results.
         """
+        return list(self.iter_cypher_query(query, parameters=parameters, container=container))
+
+    def iter_cypher_query(
+        self,
+        query: str,
+        parameters: Optional[dict] = None,
+        container: Optional[Type[MotleyGraphNodeType]] = None,
+    ) -> Iterator[list | MotleyGraphNodeType]:
+        """Run a Cypher query and iterate over the results without loading them all at once.
+
+        The query is executed immediately, the rows are fetched as the iterator is consumed.
+        If container class is provided, deserialize the results into objects of that class.
+
+        Args:
+            query: Cypher query.
+            parameters: Query parameters.
+            container: Node class to deserialize the results into. If None, return raw results.
+
+        Returns:
+            Iterator over query results.
+        """
         query_result = self._execute_query(query=query, parameters=parameters)
-        retval = []
+        return self._iter_query_result(query_result, container=container)
+
+    def _iter_query_result(
+        self, query_result: "QueryResult", container: Optional[Type[MotleyGraphNodeType]] = None
+    ) -> Iterator[list | MotleyGraphNodeType]:
+        """Iterate over the rows of a query result, optionally deserializing them.
+
+        Args:
+            query_result: Query result.
+            container: Node class to deserialize the results into. If None, return raw results.
+
+        Yields:
+            Query result rows or deserialized nodes.
+        """
         while query_result.has_next():
             row = query_result.get_next()
             if container is not None:
                 assert len(row) == 1, "Expected single column result for deserialization"
-                retval.append(self._deserialize_node(node_dict=row[0], node_class=container))
+                yield self._deserialize_node(node_dict=row[0], node_class=container)
             else:
-                retval.append(row)
-        return retval
+                yield row
+
+    def run_cypher_query_as_arrow(
+        self,
+        query: str,
+        parameters: Optional[dict] = None,
+        chunk_size: Optional[int] = None,
+    ) -> "pyarrow.Table":
+        """Run a Cypher query and return the results as a PyArrow table.
+
+        This is much faster than :meth:`run_cypher_query` for large results,
+        because the rows are converted in bulk instead of one Python object at a time.
+        Requires ``pyarrow`` to be installed.
+
+        Unlike :meth:`run_cypher_query` with a ``container``, this method does not deserialize
+        the values of JSON fields: they are returned as raw strings with the JSON prefix.
+
+        Args:
+            query: Cypher query.
+            parameters: Query parameters.
+            chunk_size: Number of rows in each record batch of the table.
+
+        Returns:
+            PyArrow table with query results.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ModuleNotInstalled("pyarrow")
+
+        query_result = self._execute_query(query=query, parameters=parameters)
+        return query_result.get_as_arrow(chunk_size=chunk_size)
 
     def _deserialize_node(
         self, node_dict: dict, node_class: Type[MotleyGraphNode]
@@ -528,18 +1161,19 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             Deserialized node.
         """
-        for field_name, value in node_dict.copy().items():
-            if isinstance(value, str) and value.startswith(
-                MotleyKuzuGraphStore.JSON_CONTENT_PREFIX
-            ):
+        for field_name in self._get_node_class_meta(node_class)["json_fields"]:
+            value = node_dict.get(field_name)
+            if not isinstance(value, str):
+                continue
+
+            json_content = value.removeprefix(_JSON_CONTENT_PREFIX)
+            if len(json_content) != len(value):
                 logger.debug(
                     "Value for field %s is marked as JSON, attempting to deserialize: %s",
                     field_name,
                     value,
                 )
-                node_dict[field_name] = json.loads(
-                    value[len(MotleyKuzuGraphStore.JSON_CONTENT_PREFIX) :]
-                )
+                node_dict[field_name] = json.loads(json_content)
 
         node = node_class.model_validate(node_dict)
         node._id = node_dict["id"]
@@ -558,8 +1192,7 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         """
         setattr(node, MotleyKuzuGraphStore.ID_ATTR, node_id)
 
-    @staticmethod
-    def _node_to_cypher_mapping_with_parameters(node: MotleyGraphNode) -> tuple[str, dict]:
+    def _node_to_cypher_mapping_with_parameters(self, node: MotleyGraphNode) -> tuple[str, dict]:
         """Convert a node to a Cypher mapping and parameters.
 
         Args:
@@ -568,28 +1201,66 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             A tuple of Cypher mapping and parameters.
         """
-        node_dict = node.model_dump()
+        cypher_mapping = self._get_node_class_meta(node.__class__)["insert_template"]
+        return cypher_mapping, self._node_to_cypher_parameters(node)
 
-        parameters = {}
+    def _node_to_cypher_parameters(self, node: MotleyGraphNode) -> dict[str, Any]:
+        """Convert a node to a dictionary of Cypher parameters, serializing JSON fields.
 
-        cypher_mapping = "{"
-        for field_name, value in node_dict.items():
-            assert field_name != "id", "id field is reserved for node id"
+        Args:
+            node: Node to convert.
+
+        Returns:
+            Dictionary of parameters keyed by field name.
+        """
+        json_fields = self._get_node_class_meta(node.__class__)["json_fields"]
 
-            _, is_json = (
-                MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(
-                    node.__class__.model_fields[field_name].annotation
+        parameters = self._get_node_field_values(node)
+        for field_name in json_fields:
+            if parameters[field_name] is not None:
+                parameters[field_name] = MotleyKuzuGraphStore._serialize_json_value(
+                    parameters[field_name]
                 )
-            )
-            if is_json and value is not None:
-                value = json.dumps(value)
-                value = MotleyKuzuGraphStore.JSON_CONTENT_PREFIX + value
 
-            cypher_mapping += f"{field_name}: ${field_name}, "
-            parameters[field_name] = value
+        return parameters
+
+    def _get_node_field_values(
+        self, node: MotleyGraphNode, include: Optional[Collection[str]] = None
+    ) -> dict[str, Any]:
+        """Get the values of a node's fields for storing in the database.
+
+        The attributes are read directly instead of using ``model_dump()``, which would
+        recursively dump nested values before they are serialized anyway.
+        If the node class has custom serializers, ``model_dump()`` is used so that they apply.
+
+        Args:
+            node: Node to get the values from.
+            include: Names of the fields to get. If None, all fields are included.
+
+        Returns:
+            Dictionary of field values keyed by field name.
+        """
+        field_names = node.__class__.model_fields if include is None else include
+        if self._get_node_class_meta(node.__class__)["custom_serializers"]:
+            values = node.model_dump(include=set(field_names))
+            return {field_name: values.get(field_name) for field_name in field_names}
 
-        cypher_mapping = cypher_mapping.rstrip(", ") + "}"
-        return cypher_mapping, parameters
+        return {field_name: getattr(node, field_name) for field_name in field_names}
+
+    @staticmethod
+    def _serialize_json_value(value: Any) -> str:
+        """Serialize a value for storing in a JSON string column.
+
+        Values that are not natively JSON-serializable, like Pydantic models,
+        are converted the same way as in ``model_dump()``.
+
+        Args:
+            value: Value to serialize.
+
+        Returns:
+            JSON string with the JSON content prefix.
+        """
+        return _JSON_CONTENT_PREFIX + json.dumps(value, default=to_jsonable_python)
 
     @staticmethod
     def _get_cypher_type_and_is_json_by_python_type_annotation(
@@ -604,14 +1275,12 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
         Returns:
             A tuple of Cypher type and whether the data should be stored in JSON-serialized strings.
         """
-        cypher_type = MotleyKuzuGraphStore.PYTHON_TO_CYPHER_TYPES_MAPPING.get(annotation)
-        if not cypher_type:
-            logger.info(
-                "No known Cypher type matching annotation %s, will use JSON string",
-                annotation,
-            )
+        try:
+            return _get_cypher_type_and_is_json_cached(annotation)
+        except TypeError:
+            # Unhashable annotations (e.g. Annotated with dict metadata) have no known Cypher type
+            logger.info("Unhashable annotation %s, will use JSON string", annotation)
             return MotleyKuzuGraphStore.PYTHON_TO_CYPHER_TYPES_MAPPING[str], True
-        return cypher_type, False
 
     @classmethod
     def from_persist_dir(
@@ -623,6 +1292,9 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
 
         Args:
             persist_dir (str): Persist directory.
+            **kwargs: Additional arguments for ``kuzu.Database``.
+                For example, ``auto_checkpoint=False`` can speed up bulk loading
+                together with :meth:`bulk_transaction`.
 
         Returns:
             Graph store.
@@ -646,3 +1318,24 @@ class MotleyKuzuGraphStore(MotleyGraphStore):
             Graph store.
         """
         return cls(**config_dict)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cypher_type_and_is_json_cached(annotation: Type) -> tuple[str, bool]:
+    """Cached implementation of
+    :meth:`MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation`.
+
+    Args:
+        annotation: Python type annotation.
+
+    Returns:
+        A tuple of Cypher type and whether the data should be stored in JSON-serialized strings.
+    """
+    cypher_type = MotleyKuzuGraphStore.PYTHON_TO_CYPHER_TYPES_MAPPING.get(annotation)
+    if not cypher_type:
+        logger.info(
+            "No known Cypher type matching annotation %s, will use JSON string",
+            annotation,
+        )
+        return MotleyKuzuGraphStore.PYTHON_TO_CYPHER_TYPES_MAPPING[str], True
+    return cypher_type, False
@@ -1,9 +1,14 @@
 import functools
 import logging
+import multiprocessing
+import multiprocessing.util
 import re
-import sys
+import threading
+from contextlib import redirect_stdout
 from io import StringIO
-from typing import Dict, List, Type
+from multiprocessing.connection import Connection
+from types import CodeType
+from typing import Dict, List, Optional, Type
 
 from pydantic import BaseModel, Field
 
@@ -11,6 +16,11 @@ from motleycrew.tools import MotleyTool
 
 logger = logging.getLogger(__name__)
 
+# Leading whitespace, backticks & "python" (if llm mistakes python console as terminal)
+LEADING_GARBAGE_RE = re.compile(r"^(\s|`)*(?i:python)?\s*")
+# Trailing whitespace & backticks
+TRAILING_GARBAGE_RE = re.compile(r"(\s|`)*$")
+
 
 @functools.lru_cache(maxsize=None)
 def warn_once() -> None:
@@ -32,20 +42,112 @@ class MissingPrintStatementError(Exception):
         )
 
 
+@functools.lru_cache(maxsize=128)
+def compile_command(command: str) -> CodeType:
+    """Compile a command, caching the result so that repeated commands
+    (e.g. when the agent retries) are not compiled again.
+
+    Args:
+        command: The command to compile
+
+    Returns:
+        CodeType: The compiled code
+    """
+    return compile(command, "<string>", "exec")
+
+
+def execute_command(command: str, namespace: Dict) -> str:
+    """Execute a Python command in the given namespace.
+
+    Args:
+        command: The command to execute
+        namespace: The globals to execute the command in
+
+    Returns:
+        str: The captured stdout, followed by the representation of the exception if one was raised
+    """
+    with redirect_stdout(StringIO()) as captured_output:
+        try:
+            # Compile and execute the command to properly catch exceptions
+            compiled_code = compile_command(command)
+            exec(compiled_code, namespace)
+        except Exception as e:
+            return captured_output.getvalue() + repr(e)
+
+    return captured_output.getvalue()
+
+
+def repl_worker(connection: Connection) -> None:
+    """Worker process loop: execute received commands in a persistent namespace
+    and send back their output.
+
+    Args:
+        connection: The worker's end of the pipe to the tool
+    """
+    namespace: Dict = {}
+    connection.send(None)  # signal that the worker is ready
+    while True:
+        try:
+            command = connection.recv()
+        except EOFError:
+            break
+        connection.send(execute_command(command, namespace))
+
+
+def stop_worker(process: multiprocessing.Process, connection: Connection) -> None:
+    """Stop a REPL worker process.
+
+    Args:
+        process: The worker process
+        connection: The tool's end of the pipe to the worker
+    """
+    connection.close()
+    if process.is_alive():
+        process.terminate()
+    process.join()
+
+
 class PythonREPLTool(MotleyTool):
     """Python REPL tool. Use this to execute python commands.
 
     Note that the tool's output is the content printed to stdout by the executed code.
     Because of this, any data you want to be in the output should be printed using `print(...)`.
+
+    By default, the code is executed in the current process. With ``isolated=True``,
+    or if a `timeout` is set, it is executed in a separate worker process instead,
+    which is started on the first call and keeps its state between calls.
+    Because of this, a long-running command does not block other tools,
+    and can be interrupted using the `timeout` argument.
     """
 
     def __init__(
-        self, return_direct: bool = False, handle_exceptions: bool | List[Type[Exception]] = False
+        self,
+        return_direct: bool = False,
+        handle_exceptions: bool | List[Type[Exception]] = False,
+        timeout: Optional[float] = None,
+        isolated: bool = False,
     ):
+        """
+        Args:
+            return_direct: If True, the tool's output will be returned directly to the user.
+            handle_exceptions: Whether to handle exceptions (see :class:`MotleyTool`).
+            timeout: Maximum execution time of a command in seconds.
+                If exceeded, the worker process is killed and the REPL state is lost.
+                If None, there is no limit. Setting a timeout implies ``isolated=True``.
+            isolated: Whether to execute the code in a separate worker process.
+                The worker is started using the "spawn" method, so scripts using an isolated
+                tool must guard their entry point with ``if __name__ == "__main__":``.
+        """
         # Warn about security risks with untrusted LLMs
         warn_once()
 
-        self.namespace: Dict = {}
+        self.timeout = timeout
+        self.isolated = isolated or timeout is not None
+        self.namespace: Dict = {}  # used if not isolated
+        self._worker: Optional[multiprocessing.Process] = None
+        self._connection: Optional[Connection] = None
+        self._finalizer: Optional[multiprocessing.util.Finalize] = None
+        self._lock = threading.Lock()
 
         if not handle_exceptions:
             handle_exceptions = [MissingPrintStatementError]
@@ -74,8 +176,8 @@ class PythonREPLTool(MotleyTool):
         Returns:
             str: The sanitized query
         """
-        query = re.sub(r"^(\s|`)*(?i:python)?\s*", "", query)
-        query = re.sub(r"(\s|`)*$", "", query)
+        query = LEADING_GARBAGE_RE.sub("", query)
+        query = TRAILING_GARBAGE_RE.sub("", query)
         return query
 
     def run(self, command: str) -> str:
@@ -83,19 +185,64 @@ class PythonREPLTool(MotleyTool):
         cleaned_command = self.sanitize_input(command)
         self.validate_input(cleaned_command)
 
-        # Capture stdout
-        old_stdout = sys.stdout
-        sys.stdout = captured_output = StringIO()
+        # Calls are serialized per tool, as they share the namespace
+        with self._lock:
+            if not self.isolated:
+                return execute_command(cleaned_command, self.namespace)
+
+            if self._worker is None or not self._worker.is_alive():
+                try:
+                    self._start_worker()
+                except EOFError:
+                    self.close()
+                    return repr(RuntimeError("The REPL process failed to start"))
+
+            self._connection.send(cleaned_command)
+            if not self._connection.poll(self.timeout):
+                self.close()
+                return repr(
+                    TimeoutError(
+                        "Execution timed out after {} seconds, "
+                        "the REPL state was reset".format(self.timeout)
+                    )
+                )
+
+            try:
+                return self._connection.recv()
+            except EOFError:
+                self.close()
+                return repr(RuntimeError("The REPL process terminated, the REPL state was reset"))
+
+    def close(self) -> None:
+        """Stop the worker process. A new one is started on the next call."""
+        if self._finalizer is not None:
+            self._finalizer()  # calls stop_worker() at most once
+        self._worker = None
+        self._connection = None
+        self._finalizer = None
+
+    def _start_worker(self) -> None:
+        """Start a new worker process with an empty namespace."""
+        self.close()
+
+        # The worker is spawned rather than forked, as forking a multithreaded process
+        # (e.g. one running crews in threads) can deadlock. It is not a daemon,
+        # so that the executed code can start processes of its own.
+        context = multiprocessing.get_context("spawn")
+        self._connection, worker_connection = context.Pipe()
+        self._worker = context.Process(target=repl_worker, args=(worker_connection,))
+        self._worker.start()
+        worker_connection.close()
+
+        # Make sure the worker is stopped when the tool is garbage collected. At interpreter exit,
+        # finalizers with an exit priority run before multiprocessing joins the non-daemon
+        # children, which would otherwise wait forever for the worker.
+        self._finalizer = multiprocessing.util.Finalize(
+            self, stop_worker, args=(self._worker, self._connection), exitpriority=0
+        )
 
-        try:
-            # Compile and execute the command to properly catch exceptions
-            compiled_code = compile(cleaned_command, "<string>", "exec")
-            exec(compiled_code, self.namespace)
-            sys.stdout = old_stdout
-            return captured_output.getvalue()
-        except Exception as e:
-            sys.stdout = old_stdout
-            return repr(e)
+        # Wait until the worker is ready, so that its startup time does not count towards timeout
+        self._connection.recv()
 
     def validate_input(self, command: str):
         if "print(" not in command:
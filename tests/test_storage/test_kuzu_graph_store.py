@@ -1,7 +1,9 @@
-from typing import Optional
+import asyncio
+from typing import Annotated, Any, Optional
 
 import kuzu
 import pytest
+from pydantic import BaseModel, PlainSerializer, field_serializer
 
 from motleycrew.common import GraphStoreType
 from motleycrew.storage import MotleyGraphNode
@@ -15,6 +17,10 @@ class Entity(MotleyGraphNode):
     optional_list_str_param: Optional[list[str]] = None
 
 
+class OtherEntity(MotleyGraphNode):
+    optional_int_param: Optional[int] = None
+
+
 @pytest.fixture
 def database(tmpdir):
     db_path = tmpdir / "test_db"
@@ -34,3 +40,426 @@ class TestMotleyKuzuGraphStore(GraphStoreFixtures):
         MotleyKuzuGraphStore._set_node_id(node=entity, node_id=2)
         with pytest.raises(AssertionError):
             graph_store.insert_node(entity)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_insert_nodes(self, graph_store):
+        entities = [
+            Entity(int_param=1),
+            Entity(int_param=2, optional_str_param="test"),
+            Entity(int_param=3, optional_list_str_param=["a", "b"]),
+            OtherEntity(),
+        ]
+        inserted_entities = graph_store.insert_nodes(entities)
+        assert inserted_entities == entities
+
+        for entity in entities:
+            assert entity.id is not None
+            retrieved_entity = graph_store.get_node_by_class_and_id(type(entity), entity.id)
+            assert retrieved_entity == entity
+            assert retrieved_entity.model_dump() == entity.model_dump()
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_create_relations(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        other_entity = OtherEntity()
+        graph_store.insert_nodes([entity1, entity2, other_entity])
+
+        graph_store.create_relations(
+            [(entity1, entity2, "p"), (entity2, entity1, "p"), (entity1, other_entity, "q")]
+        )
+
+        assert graph_store.check_relation_exists(from_node=entity1, to_node=entity2, label="p")
+        assert graph_store.check_relation_exists(from_node=entity2, to_node=entity1, label="p")
+        assert graph_store.check_relation_exists(from_node=entity1, to_node=other_entity, label="q")
+        assert not graph_store.check_relation_exists(from_node=other_entity, to_node=entity1)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_create_relations_missing_node(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        other_entity = OtherEntity()
+        graph_store.insert_nodes([entity1, entity2, other_entity])
+        ghost = Entity(int_param=3)
+        MotleyKuzuGraphStore._set_node_id(ghost, 999)
+
+        with pytest.raises(AssertionError):
+            graph_store.create_relations(
+                [(entity1, other_entity, "q"), (entity1, entity2, "p"), (entity1, ghost, "p")]
+            )
+
+        assert graph_store.run_cypher_query("MATCH ()-[r]->() RETURN count(r)") == [[0]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_insert_nodes_duplicates(self, graph_store):
+        entity = Entity(int_param=1)
+        graph_store.insert_nodes([entity, entity])
+
+        assert graph_store.run_cypher_query("MATCH (n:Entity) RETURN count(n)") == [[1]]
+        assert graph_store.check_node_exists(entity)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_bulk_transaction(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        with graph_store.bulk_transaction():
+            graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+
+        assert graph_store.check_node_exists(entity1)
+        assert graph_store.check_relation_exists(from_node=entity1, to_node=entity2, label="p")
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_bulk_transaction_rollback(self, graph_store):
+        graph_store.ensure_node_table(Entity)
+        entity = Entity(int_param=1)
+
+        with pytest.raises(ValueError):
+            with graph_store.bulk_transaction():
+                graph_store.insert_node(entity)
+                raise ValueError()
+
+        assert entity.id is None
+        assert not graph_store.check_node_exists(entity)
+
+        # The rolled back id must not be mistaken for the id of a newly inserted node
+        other_entity = graph_store.insert_node(Entity(int_param=2))
+        assert graph_store.get_node_by_class_and_id(Entity, other_entity.id).int_param == 2
+        assert not graph_store.check_node_exists(entity)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_bulk_transaction_rollback_insert_nodes(self, graph_store):
+        entities = [Entity(int_param=1), Entity(int_param=2)]
+
+        with pytest.raises(ValueError):
+            with graph_store.bulk_transaction():
+                graph_store.insert_nodes(entities)
+                raise ValueError()
+
+        assert all(entity.id is None for entity in entities)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_bulk_transaction_failed_query(self, graph_store):
+        graph_store.ensure_node_table(Entity)
+        entity = Entity(int_param=1)
+
+        # The original error must not be masked by the failing ROLLBACK
+        with pytest.raises(RuntimeError, match="Nonexistent"):
+            with graph_store.bulk_transaction():
+                graph_store.insert_node(entity)
+                graph_store.run_cypher_query("MATCH (n:Nonexistent) RETURN n")
+
+        assert entity.id is None
+        assert graph_store.run_cypher_query("MATCH (n:Entity) RETURN count(n)") == [[0]]
+
+    def test_bulk_transaction_without_auto_checkpoint(self, tmpdir):
+        graph_store = MotleyKuzuGraphStore.from_persist_dir(
+            str(tmpdir / "test_db"), auto_checkpoint=False
+        )
+        entity = Entity(int_param=1)
+        with graph_store.bulk_transaction():
+            graph_store.insert_node(entity)
+
+        assert graph_store.check_node_exists(entity)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_schema_cache(self, graph_store):
+        assert not graph_store._check_node_table_exists("Entity")
+        graph_store.ensure_node_table(Entity)
+        assert graph_store._check_node_table_exists("Entity")
+
+        graph_store.ensure_relation_table(from_class=Entity, to_class=Entity, label="p")
+        assert graph_store._check_rel_table_exists(
+            from_label="Entity", to_label="Entity", rel_label="p"
+        )
+
+        # DDL bypassing the graph store is only visible after invalidation
+        graph_store.connection.execute("CREATE NODE TABLE External (id SERIAL, PRIMARY KEY(id))")
+        assert not graph_store._check_node_table_exists("External")
+        graph_store.invalidate_schema_cache()
+        assert graph_store._check_node_table_exists("External")
+        assert graph_store._check_node_table_exists("Entity")
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_schema_cache_after_rollback(self, graph_store):
+        with pytest.raises(ValueError):
+            with graph_store.bulk_transaction():
+                graph_store.ensure_node_table(Entity)
+                raise ValueError()
+
+        assert not graph_store._check_node_table_exists("Entity")
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_prepared_statements_invalidation(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        other_entity = OtherEntity()
+        graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+        graph_store.delete_node(entity2)
+        assert ("delete_node", "Entity") in graph_store._prepared
+
+        # New relation table must be taken into account by the cached deletion queries
+        graph_store.upsert_triplet(from_node=entity1, to_node=other_entity, label="q")
+        graph_store.delete_node(entity1)
+        assert not graph_store.check_relation_exists(from_node=entity1, to_node=other_entity)
+        assert graph_store.run_cypher_query("MATCH ()-[r:q]->() RETURN count(r)") == [[0]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_upsert_triplet_existing_relation(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+        graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+
+        assert graph_store.run_cypher_query("MATCH ()-[r:p]->() RETURN count(r)") == [[1]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_upsert_triplet_with_missing_node(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        graph_store.insert_node(entity1)
+        MotleyKuzuGraphStore._set_node_id(node=entity2, node_id=100)
+
+        with pytest.raises(AssertionError):
+            graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_node_class_meta(self, graph_store):
+        graph_store.ensure_node_table(Entity)
+        meta = graph_store._node_class_meta[Entity]
+        assert meta["json_fields"] == {"optional_list_str_param"}
+        assert meta["insert_template"] == (
+            "{int_param: $int_param, optional_str_param: $optional_str_param, "
+            "optional_list_str_param: $optional_list_str_param}"
+        )
+        assert not meta["custom_serializers"]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_custom_serializers(self, graph_store):
+        class SerializedEntity(MotleyGraphNode):
+            name: str
+            code: Annotated[str, PlainSerializer(lambda value: value.lower())] = "X"
+
+            @field_serializer("name")
+            def serialize_name(self, name: str) -> str:
+                return name.upper()
+
+        entity = SerializedEntity(name="abc")
+        graph_store.insert_node(entity)
+        graph_store.insert_nodes([SerializedEntity(name="def", code="Y")])
+        assert graph_store._node_class_meta[SerializedEntity]["custom_serializers"]
+        assert graph_store.run_cypher_query(
+            "MATCH (n:SerializedEntity) RETURN n.name, n.code ORDER BY n.name"
+        ) == [["ABC", "x"], ["DEF", "y"]]
+
+        entity.name = "ghi"
+        graph_store.update_property(entity, "name")
+        assert graph_store.run_cypher_query(
+            "MATCH (n:SerializedEntity) WHERE n.id = $id RETURN n.name",
+            parameters={"id": entity.id},
+        ) == [["GHI"]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_iter_cypher_query(self, graph_store):
+        graph_store.insert_nodes([Entity(int_param=1), Entity(int_param=2)])
+
+        result = graph_store.iter_cypher_query(
+            "MATCH (a:Entity) RETURN a ORDER BY a.int_param", container=Entity
+        )
+        assert not isinstance(result, list)
+        assert [entity.int_param for entity in result] == [1, 2]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_run_cypher_query_as_arrow(self, graph_store):
+        pytest.importorskip("pyarrow")
+        graph_store.insert_nodes(
+            [Entity(int_param=1), Entity(int_param=2, optional_list_str_param=["a"])]
+        )
+
+        table = graph_store.run_cypher_query_as_arrow(
+            "MATCH (a:Entity) RETURN a.int_param AS int_param, "
+            "a.optional_list_str_param AS list_param ORDER BY int_param"
+        )
+        assert table.column_names == ["int_param", "list_param"]
+        assert table.num_rows == 2
+        assert table.column("int_param").to_pylist() == [1, 2]
+
+        # JSON fields are returned as raw prefixed strings
+        assert table.column("list_param").to_pylist() == [
+            None,
+            MotleyKuzuGraphStore.JSON_CONTENT_PREFIX + '["a"]',
+        ]
+
+    @pytest.mark.parametrize(
+        "annotation, expected",
+        [
+            (int, ("INT64", False)),
+            (Optional[str], ("STRING", False)),
+            (Optional[list[str]], ("STRING", True)),
+            (dict[str, int], ("STRING", True)),
+            (Annotated[int, {"unhashable": "metadata"}], ("STRING", True)),
+        ],
+    )
+    def test_get_cypher_type_and_is_json(self, annotation, expected):
+        assert (
+            MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(annotation)
+            == expected
+        )
+        # Cached result must be the same
+        assert (
+            MotleyKuzuGraphStore._get_cypher_type_and_is_json_by_python_type_annotation(annotation)
+            == expected
+        )
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_delete_node_with_incoming_relations(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        other_entity = OtherEntity()
+        graph_store.upsert_triplet(from_node=entity1, to_node=entity2, label="p")
+        graph_store.upsert_triplet(from_node=entity2, to_node=other_entity, label="q")
+
+        graph_store.delete_node(entity2)
+        assert not graph_store.check_node_exists(entity2)
+        assert graph_store.check_node_exists(entity1)
+        assert graph_store.check_node_exists(other_entity)
+        assert graph_store.run_cypher_query("MATCH ()-[r]->() RETURN count(r)") == [[0]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_custom_label(self, graph_store):
+        class LabeledEntity(MotleyGraphNode):
+            __label__ = "CustomLabel"
+            int_param: int
+
+        entity = LabeledEntity(int_param=1)
+        graph_store.insert_node(entity)
+        assert MotleyKuzuGraphStore._get_label(LabeledEntity) == "CustomLabel"
+        assert graph_store._check_node_table_exists("CustomLabel")
+        assert graph_store.get_node_by_class_and_id(LabeledEntity, entity.id).int_param == 1
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_insert_node_classes_with_same_name(self, graph_store):
+        # Both classes have the same label and qualified name, but different fields
+        def make_class(with_b: bool):
+            if with_b:
+
+                class Node(MotleyGraphNode):
+                    a: Optional[int] = None
+                    b: Optional[int] = None
+
+            else:
+
+                class Node(MotleyGraphNode):
+                    a: Optional[int] = None
+
+            return Node
+
+        graph_store.insert_node(make_class(with_b=True)(a=1, b=2))
+        node = graph_store.insert_node(make_class(with_b=False)(a=5))
+
+        assert graph_store.run_cypher_query(
+            "MATCH (n:Node) WHERE n.id = $id RETURN n.a, n.b", parameters={"id": node.id}
+        ) == [[5, None]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_async_insert_and_check_node_exists(self, graph_store):
+        entities = [Entity(int_param=i) for i in range(5)]
+
+        async def insert_and_check():
+            await asyncio.gather(*(graph_store.ainsert_node(entity) for entity in entities))
+            return await asyncio.gather(
+                *(graph_store.acheck_node_exists(entity) for entity in entities)
+            )
+
+        assert asyncio.run(insert_and_check()) == [True] * 5
+        assert len({entity.id for entity in entities}) == 5
+        assert graph_store.get_node_by_class_and_id(Entity, entities[3].id).int_param == 3
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_async_in_multiple_event_loops(self, graph_store):
+        async def insert(entities):
+            await asyncio.gather(*(graph_store.ainsert_node(entity) for entity in entities))
+
+        entities = [Entity(int_param=i) for i in range(6)]
+        asyncio.run(insert(entities[:3]))
+        asyncio.run(insert(entities[3:]))
+
+        assert len({entity.id for entity in entities}) == 6
+        assert graph_store.run_cypher_query("MATCH (n:Entity) RETURN count(n)") == [[6]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_async_write_inside_bulk_transaction(self, graph_store):
+        graph_store.ensure_node_table(Entity)
+        entity = Entity(int_param=1)
+
+        with pytest.raises(RuntimeError, match="bulk_transaction"):
+            with graph_store.bulk_transaction():
+                asyncio.run(graph_store.ainsert_node(entity))
+
+        assert entity.id is None
+        assert graph_store.run_cypher_query("MATCH (n:Entity) RETURN count(n)") == [[0]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_close(self, graph_store):
+        entity = graph_store.insert_node(Entity(int_param=1))
+        assert asyncio.run(graph_store.acheck_node_exists(entity))
+        connections = [graph_store.connection, *graph_store._async_connections]
+        assert len(connections) == 2
+
+        graph_store.close()
+        assert not graph_store._async_connections
+        assert all(connection.is_closed for connection in connections)
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_async_upsert_triplets(self, graph_store):
+        entity1 = Entity(int_param=1)
+        entity2 = Entity(int_param=2)
+        other_entity = OtherEntity()
+        graph_store.insert_node(entity1)
+
+        triplets = [(entity1, entity2, "p"), (entity2, other_entity, "q"), (entity1, entity2, "p")]
+        asyncio.run(graph_store.aupsert_triplets(triplets))
+
+        assert graph_store.check_node_exists(entity2)
+        assert graph_store.check_node_exists(other_entity)
+        assert graph_store.check_relation_exists(from_node=entity1, to_node=entity2, label="p")
+        assert graph_store.check_relation_exists(from_node=entity2, to_node=other_entity, label="q")
+        assert graph_store.run_cypher_query("MATCH ()-[r]->() RETURN count(r)") == [[2]]
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_property_names_are_cached(self, graph_store, monkeypatch):
+        entity = Entity(int_param=1)
+        graph_store.insert_node(entity)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Property names must be taken from the cache")
+
+        monkeypatch.setattr(graph_store, "_get_node_property_names", fail)
+        graph_store.insert_node(Entity(int_param=2))
+        entity.optional_str_param = "test"
+        assert graph_store.get_node_by_class_and_id(Entity, entity.id).optional_str_param == "test"
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_nested_model_in_json_field(self, graph_store):
+        class Payload(BaseModel):
+            values: list[int]
+
+        class EntityWithPayload(MotleyGraphNode):
+            payload: Optional[Any] = None
+
+        entity = EntityWithPayload(payload=Payload(values=[1, 2]))
+        graph_store.insert_node(entity)
+        retrieved_entity = graph_store.get_node_by_class_and_id(EntityWithPayload, entity.id)
+        assert retrieved_entity.payload == {"values": [1, 2]}
+
+        entity.payload = Payload(values=[3])
+        retrieved_entity = graph_store.get_node_by_class_and_id(EntityWithPayload, entity.id)
+        assert retrieved_entity.payload == {"values": [3]}
+
+    @pytest.mark.parametrize("graph_store", [GraphStoreType.KUZU], indirect=True)
+    def test_str_field_with_json_prefix(self, graph_store):
+        value = MotleyKuzuGraphStore.JSON_CONTENT_PREFIX + "[1, 2]"
+        entity = Entity(int_param=1, optional_str_param=value)
+        graph_store.insert_node(entity)
+
+        retrieved_entity = graph_store.get_node_by_class_and_id(Entity, entity.id)
+        assert retrieved_entity.optional_str_param == value
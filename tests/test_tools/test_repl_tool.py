@@ -1,4 +1,11 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
 from motleycrew.tools.code import PythonREPLTool
+from motleycrew.tools.code.python_repl import compile_command, execute_command
 
 
 class TestREPLTool:
@@ -20,3 +27,84 @@ class TestREPLTool:
 print(math.sqrt(16))
 """
         assert repl_tool.invoke({"command": command}).strip() == "4.0"
+
+    def test_repl_tool_exception(self):
+        repl_tool = PythonREPLTool()
+        assert repl_tool.invoke({"command": "print(1 / 0)"}) == repr(
+            ZeroDivisionError("division by zero")
+        )
+
+    def test_repl_tool_timeout(self):
+        repl_tool = PythonREPLTool(timeout=0.5)
+        assert repl_tool.invoke({"command": "print(a := 1)"}).strip() == "1"
+
+        output = repl_tool.invoke({"command": "import time; time.sleep(10); print(1)"})
+        assert output.startswith("TimeoutError")
+
+        # The state is reset after the timeout
+        assert repl_tool.invoke({"command": "print(1)"}).strip() == "1"
+        assert "NameError" in repl_tool.invoke({"command": "print(a)"})
+        repl_tool.close()
+
+    def test_repl_tool_runs_in_current_process_by_default(self):
+        repl_tool = PythonREPLTool()
+        output = repl_tool.invoke({"command": "import os; print(os.getpid())"})
+        assert int(output) == os.getpid()
+        assert repl_tool._worker is None
+
+    def test_repl_tool_runs_in_separate_process(self):
+        repl_tool = PythonREPLTool(isolated=True)
+        output = repl_tool.invoke({"command": "import os; print(os.getpid())"})
+        assert int(output) != os.getpid()
+        repl_tool.close()
+
+    def test_repl_tool_worker_start_failure(self, tmp_path):
+        # Without the main guard, the spawned worker fails to start
+        script = tmp_path / "script.py"
+        script.write_text(
+            "from motleycrew.tools.code import PythonREPLTool\n"
+            "tool = PythonREPLTool(isolated=True)\n"
+            "print(tool.invoke({'command': 'print(1)'}))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, str(script)], capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0
+        assert "RuntimeError('The REPL process failed to start')" in result.stdout
+
+    def test_repl_tool_can_start_processes(self):
+        repl_tool = PythonREPLTool(isolated=True)
+        command = """import multiprocessing
+process = multiprocessing.Process(target=int)
+process.start()
+process.join()
+print(process.exitcode)
+"""
+        assert repl_tool.invoke({"command": command}).strip() == "0"
+        repl_tool.close()
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("print(1)", "print(1)"),
+            ("```python\nprint(1)\n```", "print(1)"),
+            ("  Python print(1)  ", "print(1)"),
+            ("`print(1)`\n", "print(1)"),
+        ],
+    )
+    def test_sanitize_input(self, query, expected):
+        assert PythonREPLTool.sanitize_input(query) == expected
+
+    def test_execute_command_compiles_once(self):
+        namespace = {}
+        command = "x = globals().get('x', 0) + 1\nprint(x)"
+        compile_command.cache_clear()
+
+        assert execute_command(command, namespace).strip() == "1"
+        assert execute_command(command, namespace).strip() == "2"
+        assert compile_command.cache_info().hits == 1
+
+    def test_repl_tool_output_before_exception(self):
+        repl_tool = PythonREPLTool()
+        output = repl_tool.invoke({"command": "print('before')\nprint(1 / 0)"})
+        assert output == "before\n" + repr(ZeroDivisionError("division by zero"))